@@ -30,27 +30,56 @@ Implementation Notes
 
 """
 from time import sleep
-from struct import unpack_from
+from struct import pack, unpack
 from adafruit_bus_device import i2c_device
 
- try:
-    from typing import List, Optional
+try:
+    from typing import List, Optional, Tuple
     from circuitpython_typing import ReadableBuffer
     from busio import I2C
 except ImportError:
-    pass 
-    
+    pass
+
 __version__ = "0.0.0-auto.0"
 __repo__ = "https://github.com/veloyage/CircuitPython_SGP41.git"
 
-                            
-                                                                         
-
 _WORD_LEN = 2
+# the serial number is the longest reply
+_MAX_REPLY_WORDS = 3
+# longest command delay for which the bus stays locked between write and read
+_MAX_LOCKED_DELAY_MS = 10
+# how often to retry reading while waiting for longer conversions
+_POLL_INTERVAL_MS = 50
 
 # no point in generating this each time
 # Generated from temp 25c, humidity 50%
 _READ_CMD = b"\x26\x19\x80\x00\xA2\x66\x66\x93"
+# same default compensation, for the NOx conditioning command
+_CONDITIONING_CMD = b"\x26\x12\x80\x00\xA2\x66\x66\x93"
+_SERIAL_NUMBER_CMD = b"\x36\x82"
+_FEATURE_SET_CMD = b"\x20\x2F"
+_SELF_TEST_CMD = b"\x28\x0E"
+_SOFT_RESET_CMD = b"\x00\x06"
+
+# VOC algorithm of each sensor by (bus, address), so a sensor created again in the
+# same process continues with the warmed-up baseline of the previous instance. The
+# key holds the bus object itself, so this only carries over while the same bus is
+# reused; use save_state/restore_state across a new bus object or a reload
+_VOC_ALGORITHMS = {}
+
+
+def _crc8_shift(value: int) -> int:
+    """Clocks one byte through the sgp41's CRC polynomial (0x31), MSB first"""
+    for _ in range(8):
+        if value & 0x80:
+            value = ((value << 1) ^ 0x31) & 0xFF
+        else:
+            value = (value << 1) & 0xFF
+    return value
+
+
+# CRC of every possible byte, so the checksum advances a whole byte per lookup
+_CRC8_TABLE = bytes(_crc8_shift(i) for i in range(256))
 
 
 class SGP41:
@@ -58,6 +87,9 @@ class SGP41:
     Class to use the sgp41 Air Quality Sensor Breakout
 
     :param int address: The I2C address of the device. Defaults to :const:`0x59`
+    :param bool initialize: Run :meth:`initialize` on creation. Pass :const:`False`
+        and await :meth:`async_initialize` instead when running under asyncio.
+        Defaults to :const:`True`
 
 
     **Quickstart: Importing and using the SGP41 temperature sensor**
@@ -117,58 +149,106 @@ class SGP41:
 
     """
 
-    def __init__(self, i2c: I2C, address: int = 0x59) -> None:
-        self.i2c_device = i2c_device.I2CDevice(i2c, address)
-        self._command_buffer = bytearray(2)
-        self._measure_command = _READ_CMD
-        self._voc_algorithm = None
-
-        self.initialize()
+    # sensors by (bus, address) that already passed the identity checks and self test,
+    # this keeps a reference to each validated bus object
+    _validated = set()
+    # VOCAlgorithm class, imported on first use of the VOC index
+    _VOCAlgorithmCls = None
 
-    def initialize(self) -> None:
+    def __init__(self, i2c: I2C, address: int = 0x59, initialize: bool = True) -> None:
+        self.i2c_device = i2c_device.I2CDevice(i2c, address)
+        self._reply_buffer = bytearray(_MAX_REPLY_WORDS * (_WORD_LEN + 1))
+        self._measure_command = bytearray(_READ_CMD)
+        self._last_ticks = (None, None)
+        self._sensor_key = (i2c, address)
+        self._voc_algorithm = _VOC_ALGORITHMS.get(self._sensor_key)
+        self._voc_process = None
+        if self._voc_algorithm is not None:
+            self._voc_process = self._voc_algorithm.vocalgorithm_process
+
+        if initialize:
+            self.initialize()
+
+    def initialize(self, force: bool = False) -> None:
         """Reset the sensor to it's initial unconfigured state and configure it with sensible
-        defaults so it can be used"""
+        defaults so it can be used. The identity checks and self test only run the first
+        time the sensor at this bus and address is initialized, e.g. after a fault pass
+        ``force=True`` to run them again. A validated bus object is held on to for the
+        rest of the process.
+        :param bool force: Always run the identity checks and self test. Defaults to
+            :const:`False`
+        """
+        if force:
+            SGP41._validated.discard(self._sensor_key)
+        if self._sensor_key not in SGP41._validated:
+            self._check_identity()
+
+            # Self Test
+            self._check_self_test(
+                self._read_word_from_command(_SELF_TEST_CMD, delay_ms=500)
+            )
+            SGP41._validated.add(self._sensor_key)
+        self._reset()
+
+    async def async_initialize(self, force: bool = False) -> None:
+        """Same as :meth:`initialize`, but awaits the self test and reset delays so other
+        tasks can run meanwhile. Create the sensor with ``initialize=False`` and await this
+        before taking measurements."""
+        # pylint: disable=import-outside-toplevel
+        import asyncio
+
+        if force:
+            SGP41._validated.discard(self._sensor_key)
+        if self._sensor_key not in SGP41._validated:
+            self._check_identity()
+
+            # Self Test
+            self._check_self_test(
+                await self._async_read_word_from_command(_SELF_TEST_CMD, delay_ms=500)
+            )
+            SGP41._validated.add(self._sensor_key)
+        self._reset_issue()
+        await asyncio.sleep(1)
+
+    def _check_identity(self) -> None:
         # check serial number
-        self._command_buffer[0] = 0x36
-        self._command_buffer[1] = 0x82
-        serialnumber = self._read_word_from_command(readlen=3, delay_ms=1)
+        serialnumber = self._read_word_from_command(
+            _SERIAL_NUMBER_CMD, readlen=3, delay_ms=1
+        )
 
         if serialnumber[0] != 0x0000:
             raise RuntimeError("Serial number does not match")
 
         # Check feature set
-        self._command_buffer[0] = 0x20
-        self._command_buffer[1] = 0x2F
-        featureset = self._read_word_from_command()
+        featureset = self._read_word_from_command(_FEATURE_SET_CMD)
 
         if featureset[0] != 0x0240: # as reported by SGP41, undocumented
             raise RuntimeError(f"Feature set does not match: {featureset[0]:#x}")
 
-        # Self Test
-        self._command_buffer[0] = 0x28
-        self._command_buffer[1] = 0x0E
-        self_test = self._read_word_from_command(delay_ms=500)
+    @staticmethod
+    def _check_self_test(self_test: List[int]) -> None:
         if self_test[0] & 0b01 == 1:
             raise RuntimeError("VOC self test failed")
         if self_test[0] & 0b10 == 1:
             raise RuntimeError("NOX self test failed")
-        self._reset()
 
     def _reset(self) -> None:
+        self._reset_issue()
+        sleep(1)
+
+    def _reset_issue(self) -> None:
         # This is a general call Reset. Several sensors may see this and it doesn't appear to
         # ACK before resetting
-        self._command_buffer[0] = 0x00
-        self._command_buffer[1] = 0x06
         try:
-            self._read_word_from_command(delay_ms=50)
+            with self.i2c_device as i2c:
+                i2c.write(_SOFT_RESET_CMD)
         except (OSError, RuntimeError):
             # Got expected OSError from reset
             # or RuntimeError on some Blinka setups
             pass
-        sleep(1)
 
     @staticmethod
-    def _celsius_to_ticks(temperature: float) -> List[int]:
+    def _celsius_to_ticks(temperature: float) -> Tuple[int, int]:
         """
         Converts Temperature in Celsius to 'ticks' which are an input parameter
         the sgp41 can use
@@ -184,10 +264,10 @@ class SGP41:
         least_sig_temp_ticks = temp_ticks & 0xFF
         most_sig_temp_ticks = (temp_ticks >> 8) & 0xFF
 
-        return [most_sig_temp_ticks, least_sig_temp_ticks]
+        return most_sig_temp_ticks, least_sig_temp_ticks
 
     @staticmethod
-    def _relative_humidity_to_ticks(humidity: float) -> List[int]:
+    def _relative_humidity_to_ticks(humidity: float) -> Tuple[int, int]:
         """
         Converts Relative Humidity in % to 'ticks' which are  an input parameter
         the sgp41 can use
@@ -203,25 +283,35 @@ class SGP41:
         least_sig_rhumidity_ticks = humidity_ticks & 0xFF
         most_sig_rhumidity_ticks = (humidity_ticks >> 8) & 0xFF
 
-        return [most_sig_rhumidity_ticks, least_sig_rhumidity_ticks]
+        return most_sig_rhumidity_ticks, least_sig_rhumidity_ticks
+
+    @property
+    def raw(self) -> Tuple[int, int]:
+        """The raw VOC and NOx gas values, from a single measurement"""
+        read_value = self._read_word_from_command(
+            self._measure_command, readlen=2, delay_ms=500
+        )
+        return read_value[0], read_value[1]
+
+    async def async_raw(self) -> Tuple[int, int]:
+        """Same as :attr:`raw`, but awaits the conversion delay so other tasks can
+        run meanwhile. Also serves async reads of only the VOC or NOx value"""
+        read_value = await self._async_read_word_from_command(
+            self._measure_command, readlen=2, delay_ms=500
+        )
+        return read_value[0], read_value[1]
 
     @property
     def raw_VOC(self):
-        """The raw VOC gas value"""
-        # recycle a single buffer
-        self._command_buffer = self._measure_command
-        read_value = self._read_word_from_command(delay_ms=500)
-        self._command_buffer = bytearray(2)
-        return read_value[0]
+        """The raw VOC gas value, from a new measurement. Use :attr:`raw` to get
+        the VOC and NOx values of the same measurement"""
+        return self.raw[0]
 
     @property
     def raw_NOX(self):
-        """The raw NOx gas value"""
-        # recycle a single buffer
-        self._command_buffer = self._measure_command
-        read_value = self._read_word_from_command(readlen=2, delay_ms=50)
-        self._command_buffer = bytearray(2)
-        return read_value[1]
+        """The raw NOx gas value, from a new measurement. Use :attr:`raw` to get
+        the VOC and NOx values of the same measurement"""
+        return self.raw[1]
 
     def conditioning(self):
         """
@@ -230,11 +320,7 @@ class SGP41:
         Command returns VOC raw value, but not NOX.
         After 10s, the normal measure command should be run.
         """
-        # recycle a single buffer
-        self._command_buffer = b"\x26\x12\x80\x00\xA2\x66\x66\x93"
-        read_value = self._read_word_from_command(delay_ms=50)
-        self._command_buffer = bytearray(2)
-        return read_value[0]
+        return self._read_word_from_command(_CONDITIONING_CMD, delay_ms=50)[0]
 
     def compensate(self, temperature=25, relative_humidity=50):
         """
@@ -247,19 +333,21 @@ class SGP41:
 
         Adjusts the raw gas values for the current temperature (c) and humidity (%)
         """
-        # recycle a single buffer
-        _compensated_read_cmd = [0x26, 0x19]
         humidity_ticks = self._relative_humidity_to_ticks(relative_humidity)
-        humidity_ticks.append(self._generate_crc(humidity_ticks))
         temp_ticks = self._celsius_to_ticks(temperature)
-        temp_ticks.append(self._generate_crc(temp_ticks))
-        _cmd = _compensated_read_cmd + humidity_ticks + temp_ticks
-        self._measure_command = bytearray(_cmd)
+        # the command only changes when the ticks do
+        if (humidity_ticks, temp_ticks) == self._last_ticks:
+            return
+        # recycle a single buffer, the command code in bytes 0..1 stays as is
+        cmd = self._measure_command
+        cmd[2], cmd[3] = humidity_ticks
+        cmd[5], cmd[6] = temp_ticks
+        cmd[4] = self._crc2(*humidity_ticks)
+        cmd[7] = self._crc2(*temp_ticks)
+        self._last_ticks = (humidity_ticks, temp_ticks)
         #return self.raw_VOC
 
-                      
     def measure_index(self, raw, temperature=25, relative_humidity=50):
-             
         """Measure VOC index after humidity compensation
         :param float temperature: The temperature in degrees Celsius, defaults to :const:`25`
         :param float relative_humidity: The relative humidity in percentage, defaults to :const:`50`
@@ -271,67 +359,167 @@ class SGP41:
         :note 00-500, ventilate, purify intensely
         :return int The VOC index measured, ranged from 0 to 500
         """
-        # import/setup algorithm only on use of index
-        # pylint: disable=import-outside-toplevel
-        from adafruit_sgp41.voc_algorithm import (
-            VOCAlgorithm,
-        )
-
         if self._voc_algorithm is None:
-            self._voc_algorithm = VOCAlgorithm()
-            self._voc_algorithm.vocalgorithm_init()
+            self._start_voc_algorithm()
 
         # self.compensate(temperature, relative_humidity)
         # raw = self.raw_VOC
-        if raw < 0:
-            return -1
-        voc_index = self._voc_algorithm.vocalgorithm_process(raw)
-        return voc_index
+        return -1 if raw < 0 else self._voc_process(raw)
+
+    def _start_voc_algorithm(self) -> None:
+        # another instance for this sensor may have started the algorithm meanwhile
+        algorithm = _VOC_ALGORITHMS.get(self._sensor_key)
+        if algorithm is None:
+            # import/setup algorithm only on use of index, once for all instances
+            algorithm_cls = SGP41._VOCAlgorithmCls
+            if algorithm_cls is None:
+                # pylint: disable=import-outside-toplevel
+                from .voc_algorithm import VOCAlgorithm as algorithm_cls
+
+                SGP41._VOCAlgorithmCls = algorithm_cls
+
+            algorithm = algorithm_cls()
+            algorithm.vocalgorithm_init()
+            _VOC_ALGORITHMS[self._sensor_key] = algorithm
+
+        self._voc_algorithm = algorithm
+        self._voc_process = algorithm.vocalgorithm_process
+
+    def save_state(self) -> bytes:
+        """Save the learned baseline of the VOC index algorithm, e.g. to storage before
+        a reload or power cycle, so it can be handed to :meth:`restore_state` later.
+        :return bytes The algorithm state, 8 bytes
+        """
+        if self._voc_algorithm is None:
+            raise RuntimeError("VOC index algorithm has not been started")
+        return pack(">ii", *self._voc_algorithm.vocalgorithm_get_states())
+
+    def restore_state(self, state: ReadableBuffer) -> None:
+        """Restart the VOC index algorithm from a state saved by :meth:`save_state`,
+        skipping the initial learning phase. Sensirion recommends restoring only if the
+        sensor was off for less than 10 minutes. Other instances for the same sensor
+        share the restored algorithm.
+        :param state: The saved algorithm state
+        """
+        self._start_voc_algorithm()
+        # restart in place, so instances sharing the algorithm keep doing so
+        self._voc_algorithm.vocalgorithm_init()
+        self._voc_algorithm.vocalgorithm_set_states(*unpack(">ii", state))
 
     def _read_word_from_command(
         self,
+        cmd: ReadableBuffer,
         delay_ms: int = 10,
         readlen: Optional[int] = 1,
     ) -> Optional[List[int]]:
         """_read_word_from_command - send a given command code and read the result back
 
         Args:
+            cmd (ReadableBuffer): The command to send, including any arguments.
             delay_ms (int, optional): The delay between write and read, in milliseconds.
-                Defaults to 10ms
+                Delays longer than 50ms are an upper bound, the reply is polled for
+                every 50ms. Defaults to 10ms
             readlen (int, optional): The number of bytes to read. Defaults to 1.
         """
-        # TODO: Take 2-byte command as int (0x280E, 0x0006) and packinto command buffer
-
-        with self.i2c_device as i2c:
-            i2c.write(self._command_buffer)
-
-        sleep(round(delay_ms * 0.001, 3))
-
         if readlen is None:
+            with self.i2c_device as i2c:
+                i2c.write(cmd)
+            sleep(delay_ms * 0.001)
             return None
-        readdata_buffer = []
 
         # The number of bytes to read back, based on the number of words to read
         replylen = readlen * (_WORD_LEN + 1)
         # recycle buffer for read/write w/length
-        replybuffer = bytearray(replylen)
+        replybuffer = self._reply_buffer
+
+        if delay_ms <= _MAX_LOCKED_DELAY_MS:
+            # short commands keep the bus for the whole exchange
+            with self.i2c_device as i2c:
+                i2c.write(cmd)
+                sleep(delay_ms * 0.001)
+                i2c.readinto(replybuffer, end=replylen)
+            return self._parse_reply(readlen)
 
+        # long conversions free the bus for other devices while waiting
         with self.i2c_device as i2c:
-            i2c.readinto(replybuffer, end=replylen)
+            i2c.write(cmd)
+
+        # the delay is the worst case, so read early and retry while the sensor
+        # is still busy (NACK) or the reply is not valid yet
+        attempts, poll_delay = self._poll_schedule(delay_ms)
+        for _ in range(attempts - 1):
+            sleep(poll_delay)
+            try:
+                return self._read_reply(readlen)
+            except (OSError, RuntimeError):
+                pass
+        sleep(poll_delay)
+        return self._read_reply(readlen)
+
+    async def _async_read_word_from_command(
+        self,
+        cmd: ReadableBuffer,
+        delay_ms: int = 10,
+        readlen: int = 1,
+    ) -> List[int]:
+        """_async_read_word_from_command - like _read_word_from_command, but awaits
+        the delay between write and read instead of blocking"""
+        # pylint: disable=import-outside-toplevel
+        import asyncio
 
-        for i in range(0, replylen, 3):
-            if not self._check_crc8(replybuffer[i : i + 2], replybuffer[i + 2]):
+        with self.i2c_device as i2c:
+            i2c.write(cmd)
+
+        attempts, poll_delay = self._poll_schedule(delay_ms)
+        for _ in range(attempts - 1):
+            await asyncio.sleep(poll_delay)
+            try:
+                return self._read_reply(readlen)
+            except (OSError, RuntimeError):
+                pass
+        await asyncio.sleep(poll_delay)
+        return self._read_reply(readlen)
+
+    @staticmethod
+    def _poll_schedule(delay_ms: int) -> Tuple[int, float]:
+        """Splits a command delay into the number of read attempts and the sleep
+        before each, in seconds. The last attempt comes no earlier than the delay"""
+        if delay_ms <= _POLL_INTERVAL_MS:
+            return 1, delay_ms * 0.001
+        return -(-delay_ms // _POLL_INTERVAL_MS), _POLL_INTERVAL_MS * 0.001
+
+    def _read_reply(self, readlen: int) -> List[int]:
+        """Reads and unpacks readlen words from the sensor"""
+        with self.i2c_device as i2c:
+            i2c.readinto(self._reply_buffer, end=readlen * (_WORD_LEN + 1))
+
+        return self._parse_reply(readlen)
+
+    def _parse_reply(self, readlen: int) -> List[int]:
+        """Checks and unpacks the first readlen words of the reply buffer"""
+        readdata_buffer = [0] * readlen
+        replybuffer = self._reply_buffer
+        replylen = readlen * (_WORD_LEN + 1)
+        # local name, the loop looks the table up twice per word
+        crc_table = _CRC8_TABLE
+
+        for word, i in enumerate(range(0, replylen, 3)):
+            high = replybuffer[i]
+            low = replybuffer[i + 1]
+            # same as _crc2, inlined to save the call
+            if crc_table[crc_table[0xFF ^ high] ^ low] != replybuffer[i + 2]:
                 raise RuntimeError("CRC check failed while reading data")
-            readdata_buffer.append(unpack_from(">H", replybuffer[i : i + 2])[0])
+            readdata_buffer[word] = (high << 8) | low
 
         return readdata_buffer
 
-    def _check_crc8(self, crc_buffer: ReadableBuffer, crc_value: int) -> bool:
+    @staticmethod
+    def _crc2(high: int, low: int) -> int:
         """
-        Checks that the 8 bit CRC Checksum value from the sensor matches the
-        received data
+        Generates the 8 bit CRC Checksum of a single word, given as its two bytes.
+        Since the sensor only checksums 2-byte data packets, no loop is needed.
         """
-        return crc_value == self._generate_crc(crc_buffer)
+        return _CRC8_TABLE[_CRC8_TABLE[0xFF ^ high] ^ low]
 
     @staticmethod
     def _generate_crc(crc_buffer: ReadableBuffer) -> int:
@@ -345,12 +533,5 @@ class SGP41:
         """
         crc = 0xFF
         for byte in crc_buffer:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 0x80:
-                    crc = (
-                        crc << 1
-                    ) ^ 0x31  # 0x31 is the Seed for sgp41's CRC polynomial
-                else:
-                    crc = crc << 1
-        return crc & 0xFF  # Returns only bottom 8 bits
+            crc = _CRC8_TABLE[crc ^ byte]
+        return crc
@@ -18,6 +18,16 @@ try:
 except ImportError:
     pass
 
+try:
+    # JIT compiles the fixed point math on hosts that provide numba
+    from numba import njit
+except ImportError:
+
+    def njit(*_args, **_kwargs):
+        """Stand-in for numba.njit that leaves the function as is"""
+        return lambda func: func
+
+
 _VOCALGORITHM_SAMPLING_INTERVAL = const(1)
 _VOCALGORITHM_INITIAL_BLACKOUT = const(45)
 _VOCALGORITHM_VOC_INDEX_GAIN = const(230)
@@ -51,6 +61,117 @@ _FIX16_OVERFLOW = const(0x80000000)
 _FIX16_ONE = const(0x00010000)
 
 
+# pylint: disable=invalid-name,missing-function-docstring
+# Fixed point math conversion from C
+
+
+@njit(cache=True)
+def _fix16_mul(inarg0: float, inarg1: float) -> int:
+    inarg0 = int(inarg0)
+    inarg1 = int(inarg1)
+    A = inarg0 >> 16
+    if inarg0 < 0:
+        B = (inarg0 & 0xFFFFFFFF) & 0xFFFF
+    else:
+        B = inarg0 & 0xFFFF
+    C = inarg1 >> 16
+    if inarg1 < 0:
+        D = (inarg1 & 0xFFFFFFFF) & 0xFFFF
+    else:
+        D = inarg1 & 0xFFFF
+    AC = A * C
+    AD_CB = A * D + C * B
+    BD = B * D
+    product_hi = AC + (AD_CB >> 16)
+    ad_cb_temp = ((AD_CB) << 16) & 0xFFFFFFFF
+    product_lo = ((BD + ad_cb_temp)) & 0xFFFFFFFF
+    if product_lo < BD:
+        product_hi = product_hi + 1
+    if (product_hi >> 31) != (product_hi >> 15):
+        return _FIX16_OVERFLOW
+    product_lo_tmp = product_lo & 0xFFFFFFFF
+    product_lo = (product_lo - 0x8000) & 0xFFFFFFFF
+    product_lo = (product_lo - ((product_hi & 0xFFFFFFFF) >> 31)) & 0xFFFFFFFF
+    if product_lo > product_lo_tmp:
+        product_hi = product_hi - 1
+    result = (product_hi << 16) | (product_lo >> 16)
+    result += 1
+    return result
+
+
+@njit(cache=True)
+def _fix16_div(a: float, b: float) -> int:
+    a = int(a)
+    b = int(b)
+    if b == 0:
+        return _FIX16_MINIMUM
+    if a >= 0:
+        remainder = a
+    else:
+        remainder = (a * (-1)) & 0xFFFFFFFF
+    if b >= 0:
+        divider = b
+    else:
+        divider = (b * (-1)) & 0xFFFFFFFF
+    quotient = 0
+    bit = 0x10000
+    while divider < remainder:
+        divider = divider << 1
+        bit <<= 1
+    if not bit:
+        return _FIX16_OVERFLOW
+    if divider & 0x80000000:
+        if remainder >= divider:
+            quotient |= bit
+            remainder -= divider
+        divider >>= 1
+        bit >>= 1
+    while bit and remainder:
+        if remainder >= divider:
+            quotient |= bit
+            remainder -= divider
+        remainder <<= 1
+        bit >>= 1
+    if remainder >= divider:
+        quotient += 1
+    result = quotient
+    if (a ^ b) & 0x80000000:
+        if result == _FIX16_MINIMUM:
+            return _FIX16_OVERFLOW
+        result = -result
+    return result
+
+
+@njit(cache=True)
+def _fix16_sqrt(x: float) -> int:
+    x = int(x)
+    num = x & 0xFFFFFFFF
+    result = 0
+    bit = 1 << 30
+    while bit > num:
+        bit >>= 2
+    for n in range(0, 2):
+        while bit:
+            if num >= result + bit:
+                num = num - (result + bit) & 0xFFFFFFFF
+                result = (result >> 1) + bit
+            else:
+                result = result >> 1
+            bit >>= 2
+        if n == 0:
+            if num > 65535:
+                num = (num - result) & 0xFFFFFFFF
+                num = ((num << 16) - 0x8000) & 0xFFFFFFFF
+                result = ((result << 16) + 0x8000) & 0xFFFFFFFF
+            else:
+                num = (num << 16) & 0xFFFFFFFF
+                result = (result << 16) & 0xFFFFFFFF
+            bit = 1 << 14
+    if num > result:
+        result += 1
+    return result
+
+
 class DFRobot_vocalgorithmParams:
     """Class for voc index algorithm"""
 
@@ -107,106 +228,10 @@ class VOCAlgorithm:
     def _fix16_cast_to_int(self, a: float) -> int:
         return int(a) >> 16
 
-    def _fix16_mul(self, inarg0: float, inarg1: float) -> int:
-        inarg0 = int(inarg0)
-        inarg1 = int(inarg1)
-        A = inarg0 >> 16
-        if inarg0 < 0:
-            B = (inarg0 & 0xFFFFFFFF) & 0xFFFF
-        else:
-            B = inarg0 & 0xFFFF
-        C = inarg1 >> 16
-        if inarg1 < 0:
-            D = (inarg1 & 0xFFFFFFFF) & 0xFFFF
-        else:
-            D = inarg1 & 0xFFFF
-        AC = A * C
-        AD_CB = A * D + C * B
-        BD = B * D
-        product_hi = AC + (AD_CB >> 16)
-        ad_cb_temp = ((AD_CB) << 16) & 0xFFFFFFFF
-        product_lo = ((BD + ad_cb_temp)) & 0xFFFFFFFF
-        if product_lo < BD:
-            product_hi = product_hi + 1
-        if (product_hi >> 31) != (product_hi >> 15):
-            return _FIX16_OVERFLOW
-        product_lo_tmp = product_lo & 0xFFFFFFFF
-        product_lo = (product_lo - 0x8000) & 0xFFFFFFFF
-        product_lo = (product_lo - ((product_hi & 0xFFFFFFFF) >> 31)) & 0xFFFFFFFF
-        if product_lo > product_lo_tmp:
-            product_hi = product_hi - 1
-        result = (product_hi << 16) | (product_lo >> 16)
-        result += 1
-        return result
-
-    def _fix16_div(self, a: float, b: float) -> int:
-        a = int(a)
-        b = int(b)
-        if b == 0:
-            return _FIX16_MINIMUM
-        if a >= 0:
-            remainder = a
-        else:
-            remainder = (a * (-1)) & 0xFFFFFFFF
-        if b >= 0:
-            divider = b
-        else:
-            divider = (b * (-1)) & 0xFFFFFFFF
-        quotient = 0
-        bit = 0x10000
-        while divider < remainder:
-            divider = divider << 1
-            bit <<= 1
-        if not bit:
-            return _FIX16_OVERFLOW
-        if divider & 0x80000000:
-            if remainder >= divider:
-                quotient |= bit
-                remainder -= divider
-            divider >>= 1
-            bit >>= 1
-        while bit and remainder:
-            if remainder >= divider:
-                quotient |= bit
-                remainder -= divider
-            remainder <<= 1
-            bit >>= 1
-        if remainder >= divider:
-            quotient += 1
-        result = quotient
-        if (a ^ b) & 0x80000000:
-            if result == _FIX16_MINIMUM:
-                return _FIX16_OVERFLOW
-            result = -result
-        return result
-
-    def _fix16_sqrt(self, x: float) -> int:
-        x = int(x)
-        num = x & 0xFFFFFFFF
-        result = 0
-        bit = 1 << 30
-        while bit > num:
-            bit >>= 2
-        for n in range(0, 2):
-            while bit:
-                if num >= result + bit:
-                    num = num - (result + bit) & 0xFFFFFFFF
-                    result = (result >> 1) + bit
-                else:
-                    result = result >> 1
-                bit >>= 2
-            if n == 0:
-                if num > 65535:
-                    num = (num - result) & 0xFFFFFFFF
-                    num = ((num << 16) - 0x8000) & 0xFFFFFFFF
-                    result = ((result << 16) + 0x8000) & 0xFFFFFFFF
-                else:
-                    num = (num << 16) & 0xFFFFFFFF
-                    result = (result << 16) & 0xFFFFFFFF
-                bit = 1 << 14
-        if num > result:
-            result += 1
-        return result
+    # the fixed point primitives are plain functions so numba can compile them
+    _fix16_mul = staticmethod(_fix16_mul)
+    _fix16_div = staticmethod(_fix16_div)
+    _fix16_sqrt = staticmethod(_fix16_sqrt)
 
     def _fix16_exp(self, x: float) -> int:
         x = int(x)
@@ -275,14 +300,13 @@ class VOCAlgorithm:
         self._vocalgorithm__adaptive_lowpass__init()
         self._vocalgorithm__adaptive_lowpass__set_parameters()
 
-    def _vocalgorithm_get_states(self, state0: int, state1: int) -> Tuple[int, int]:
+    def vocalgorithm_get_states(self) -> Tuple[int, int]:
         state0 = self._vocalgorithm__mean_variance_estimator__get_mean()
         state1 = self._vocalgorithm__mean_variance_estimator__get_std()
         return state0, state1
 
-    def _vocalgorithm_set_states(self, state0: int, state1: int) -> None:
+    def vocalgorithm_set_states(self, state0: int, state1: int) -> None:
         self._vocalgorithm__mean_variance_estimator__set_states(
-            self.params,
             state0,
             state1,
             self._f16(_VOCALGORITHM_PERSISTENCE_UPTIME_GAMMA),
@@ -0,0 +1,25 @@
+# SPDX-FileCopyrightText: 2026 Thomas Ziemann
+#
+# SPDX-License-Identifier: Unlicense
+import time
+import board
+import adafruit_sgp40
+
+i2c = board.I2C()  # uses board.SCL and board.SDA
+sgp = adafruit_sgp40.SGP41(i2c)
+
+# Let the VOC index algorithm learn for a while, sampling at 1 hertz
+for _ in range(60):
+    print("VOC Index:", sgp.measure_index(sgp.raw_VOC))
+    time.sleep(1)
+
+# Keep this e.g. in a file or NVM to continue after a reload or power cycle
+state = sgp.save_state()
+print("Saved state:", state)
+
+# A second instance picks up the learned baseline instead of starting over
+restored = adafruit_sgp40.SGP41(i2c, initialize=False)
+restored.restore_state(state)
+assert restored.save_state() == state, "Restored state does not match"
+print("Restored state:", restored.save_state())
+print("VOC Index:", restored.measure_index(restored.raw_VOC))